@@ -5,8 +5,7 @@ import asyncio
 from argparse import ArgumentParser, Namespace
 
 from . import logging
-from .torrentrss import TorrentRSS
-from .constants import VERSION, CONFIG_PATH, CONFIG_SCHEMA
+from .constants import VERSION, CONFIG_SCHEMA, config_path
 from .utils import show_exception_notification
 
 
@@ -42,13 +41,17 @@ async def _main() -> None:
         print(schema)
         return
 
+    # imported here rather than at the top, as it pulls in aiohttp, feedparser
+    # and jsonschema which would otherwise slow down --version and --schema
+    from .torrentrss import TorrentRSS
+
     logging.configure(level=arguments.logging_level)
 
     app: TorrentRSS
     try:
         app = await TorrentRSS.from_path()
     except FileNotFoundError:
-        message = f'No config file found at {str(CONFIG_PATH)!r}. ' \
+        message = f'No config file found at {str(config_path())!r}. ' \
             + "See '--schema' for reference."
         parser.error(message)
 
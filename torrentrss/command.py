@@ -1,56 +1,63 @@
 from __future__ import annotations
 
-import re
-from typing import Optional, List, Iterator, Match, cast
-from subprocess import STARTUPINFO, STARTF_USESHOWWINDOW
+import subprocess
+from typing import Optional, List, cast
 
 from . import logging
 from .constants import WINDOWS, COMMAND_URL_ARGUMENT
-from .utils import run_subprocess, open_with_default_application
+from .utils import start_subprocess, open_with_default_application
+
+
+_startupinfo: Optional[subprocess.STARTUPINFO]
+if WINDOWS:
+    # only ever read by Popen, so the one instance is shared by every launch
+    _startupinfo = subprocess.STARTUPINFO()
+    _startupinfo.dwFlags = subprocess.STARTF_USESHOWWINDOW
+else:
+    _startupinfo = None
 
 
 class Command:
+    __slots__ = ('arguments', 'url_indices')
+
     arguments: Optional[List[str]]
+    url_indices: List[int]
 
     def __init__(self, arguments: Optional[List[str]] = None) -> None:
         self.arguments = arguments
+        # the positions of the arguments containing COMMAND_URL_ARGUMENT are
+        # found up front, so launching only has to substitute into those and
+        # can copy the rest of the list as is
+        self.url_indices = (
+            [] if arguments is None else
+            [
+                index for index, argument in enumerate(arguments)
+                if COMMAND_URL_ARGUMENT in argument
+            ]
+        )
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}(arguments={self.arguments})'
 
-    def subbed_arguments(self, url: str) -> Iterator[str]:
-        # The repl parameter here is a function which at first looks like it
-        # could just be a string, but it actually needs to be a function or
-        # else escapes in the string would be processed, leading to problems
-        # when dealing with file paths, for example.
-        # See: https://docs.python.org/3/library/re.html#re.sub
-        #      https://stackoverflow.com/a/16291763/3289208
-        def replacer(_: Match) -> str:
-            return url
-        for argument in cast(List[str], self.arguments):
-            yield re.sub(
-                pattern=re.escape(COMMAND_URL_ARGUMENT),
-                repl=replacer,
-                string=argument
-            )
+    def subbed_arguments(self, url: str) -> List[str]:
+        # COMMAND_URL_ARGUMENT is a plain literal, so str.replace does the job
+        # without the regex engine. it also leaves backslashes in the URL
+        # alone, which re.sub would have treated as escapes in a string repl.
+        arguments = cast(List[str], self.arguments).copy()
+        for index in self.url_indices:
+            arguments[index] = arguments[index].replace(COMMAND_URL_ARGUMENT, url)
+        return arguments
 
     async def __call__(self, url: str) -> None:
         if self.arguments is None:
             await logging.info(f'Launching {url!r} with default program')
             await open_with_default_application(url)
         else:
-            arguments = list(self.subbed_arguments(url))
-            startupinfo: Optional[STARTUPINFO]
-            if WINDOWS:
-                startupinfo = STARTUPINFO()
-                startupinfo.dwFlags = STARTF_USESHOWWINDOW
-            else:
-                startupinfo = None
-
+            arguments = self.subbed_arguments(url)
             await logging.info(
                 f'Launching subprocess with arguments {arguments}'
             )
-            await run_subprocess(
+            await start_subprocess(
                 args=arguments,
-                startupinfo=startupinfo
+                startupinfo=_startupinfo
             )
@@ -2,16 +2,13 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from functools import lru_cache
 
 import appdirs
 
 
 NAME = 'torrentrss'
 VERSION = '0.9.0'
-CONFIG_PATH = Path(
-    appdirs.user_config_dir(appname=NAME, roaming=True),
-    'config.json'
-)
 LOG_MESSAGE_FORMAT = '[%(asctime)s %(levelname)s] %(message)s'
 COMMAND_URL_ARGUMENT = '$URL'
 TORRENT_MIMETYPE = 'application/x-bittorrent'
@@ -47,6 +44,18 @@ CONFIG_SCHEMA = {
                             "description": "User agent used to send the GET request to download the feed. If missing, the global 'default_user_agent' is used.",
                             "type": "string"
                         },
+                        "etag": {
+                            "description": "The ETag header the feed was last downloaded with. This and 'last_modified' below are updated automatically and sent back on the next check, so that a feed with nothing new isn't downloaded again. They are only sent while the feed's 'url' and 'subscriptions' are as they were when saved, according to 'fingerprint' below, so changing the URL, adding or editing a subscription, or lowering an episode number always downloads the feed again.",
+                            "type": "string"
+                        },
+                        "fingerprint": {
+                            "description": "A hash of the feed's 'url' and 'subscriptions' as they were when 'etag' and 'last_modified' were saved. Updated automatically.",
+                            "type": "string"
+                        },
+                        "last_modified": {
+                            "description": "The Last-Modified header the feed was last downloaded with. See 'etag', as the same applies here.",
+                            "type": "string"
+                        },
                         "subscriptions": {
                             "type": "object",
                             "patternProperties": {
@@ -93,3 +102,13 @@ CONFIG_SCHEMA = {
         "feeds"
     ]
 }
+
+
+# Resolved on first use rather than at import, as on Windows finding the
+# config directory means calling into the shell API
+@lru_cache(maxsize=None)
+def config_path() -> Path:
+    return Path(
+        appdirs.user_config_dir(appname=NAME, roaming=True),
+        'config.json'
+    )
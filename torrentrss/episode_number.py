@@ -4,6 +4,8 @@ from typing import Optional, Match, Any
 
 
 class EpisodeNumber:
+    __slots__ = ('series', 'episode')
+
     series: Optional[int]
     episode: Optional[int]
 
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import json
+import asyncio
+import hashlib
+from functools import partial
 from typing import Dict, Optional, AsyncIterator, Tuple
 
+import feedparser
 from aiohttp import ClientSession
 from feedparser import FeedParserDict, parse as parse_feed
 
@@ -13,11 +18,30 @@ from .subscription import Subscription
 from .episode_number import EpisodeNumber
 
 
+# only entries' titles and links are ever used, so feedparser needn't spend
+# time resolving relative URLs inside their HTML content. sanitising is left
+# on, as it also strips markup such as <script> from HTML-typed titles, which
+# is what subscriptions' patterns are matched against.
+feedparser.RESOLVE_RELATIVE_URIS = False
+
+
+def fingerprint_feed(url: str, subscriptions: Json) -> str:
+    # the saved validators only say whether the feed has changed, so they're
+    # tied to the URL and subscriptions they were saved with. a feed which
+    # hasn't changed can still have new matches if the subscriptions have,
+    # and another URL's validators say nothing about it at all.
+    text = json.dumps([url, subscriptions], sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
 class Feed:
     subscriptions: Dict[str, Subscription]
     name: str
     url: str
     user_agent: Optional[str]
+    headers: Dict[str, str]
+    etag: Optional[str]
+    last_modified: Optional[str]
 
     def __init__(
         self, *,
@@ -25,6 +49,9 @@ class Feed:
         url: str,
         subscriptions: Json,
         user_agent: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        fingerprint: Optional[str] = None
     ) -> None:
         self.name = name
         self.url = url
@@ -33,71 +60,126 @@ class Feed:
             for name, sub_dict in subscriptions.items()
         }
         self.user_agent = user_agent
+        self.headers = (
+            {} if user_agent is None else
+            {'User-Agent': user_agent}
+        )
+        if fingerprint == fingerprint_feed(url, subscriptions):
+            self.etag = etag
+            self.last_modified = last_modified
+        else:
+            self.etag = None
+            self.last_modified = None
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}(name={self.name!r}, url={self.url!r})'
 
-    async def fetch(self) -> FeedParserDict:
-        headers = (
-            {} if self.user_agent is None else
-            {'User-Agent': self.user_agent}
-        )
-        async with ClientSession(headers=headers) as session:
-            async with session.get(self.url) as response:
-                if response.status != 200:
-                    raise FeedError(
-                        f'Feed {self.name!r}: error sending '
-                        + f'request to {self.url!r}'
-                    )
-                text = await response.text()
+    async def fetch(self, session: ClientSession) -> Optional[FeedParserDict]:
+        headers = self.headers
+        # validators from the previous response let the server answer with
+        # an empty 304 if nothing has been posted since
+        if self.etag is not None or self.last_modified is not None:
+            headers = headers.copy()
+            if self.etag is not None:
+                headers['If-None-Match'] = self.etag
+            if self.last_modified is not None:
+                headers['If-Modified-Since'] = self.last_modified
 
-        rss = parse_feed(text)
+        async with session.get(self.url, headers=headers) as response:
+            if response.status == 304:
+                await logging.info(
+                    f'Feed {self.name!r}: url {self.url!r} not modified'
+                )
+                return None
+            if response.status != 200:
+                raise FeedError(
+                    f'Feed {self.name!r}: error sending '
+                    + f'request to {self.url!r}'
+                )
+            # the raw body is handed to feedparser, which works out the
+            # encoding itself. decoding it first with response.text() would
+            # make a second full copy of the feed, and possibly run charset
+            # detection over all of it too. only the charset is passed on, as
+            # feedparser flags any non-XML media type as an error and plenty
+            # of sites serve their feeds as text/html.
+            body = await response.read()
+            response_headers = (
+                {} if response.charset is None else
+                {'content-type': f'application/xml; charset={response.charset}'}
+            )
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+        # parsing is CPU bound, so it's done on the executor to let the other
+        # feeds' downloads carry on in the meantime
+        loop = asyncio.get_event_loop()
+        rss = await loop.run_in_executor(
+            None,
+            partial(parse_feed, body, response_headers=response_headers)
+        )
         if rss['bozo']:
             raise FeedError(
                 f'Feed {self.name!r}: error parsing url {self.url!r}'
             ) from rss['bozo_exception']
+        # only remembered once the body has parsed, so that a feed which
+        # failed to parse isn't skipped as unmodified on the next check
+        self.etag = etag
+        self.last_modified = last_modified
 
         await logging.info(f'Feed {self.name!r}: downloaded url {self.url!r}')
         return rss
 
-    async def matching_subs(self) -> AsyncIterator[Tuple[Subscription, FeedParserDict]]:
+    async def matching_subs(
+        self,
+        session: ClientSession
+    ) -> AsyncIterator[Tuple[Subscription, FeedParserDict]]:
         if not self.subscriptions:
             return
 
-        rss = await self.fetch()
+        rss = await self.fetch(session)
+        if rss is None:
+            return
+
+        debug = logging.is_enabled_for('DEBUG')
         # episode numbers are compared against subscriptions' numbers as they
         # were at the beginning of the method rather than comparing to the most
         # recent match. this ensures that all matches in the feed are yielded
-        # regardless of whether they are in numeric order.
-        original_numbers = {
-            sub: sub.number for sub in
-            self.subscriptions.values()
-        }
+        # regardless of whether they are in numeric order. they're kept
+        # alongside each subscription's bound search method and literal prefix
+        # so the inner loop needs no attribute or dict lookups to get at them.
+        subscriptions = tuple(
+            (sub, sub.prefix, sub.regex.search, sub.number)
+            for sub in self.subscriptions.values()
+        )
 
-        for index, entry in enumerate(reversed(rss['entries'])):
-            index = len(rss['entries']) - index - 1
-            for sub in self.subscriptions.values():
-                match = sub.regex.search(entry['title'])
+        entries = rss['entries']
+        for index in range(len(entries) - 1, -1, -1):
+            entry = entries[index]
+            title = entry['title']
+            for sub, prefix, search, original_number in subscriptions:
+                # titles without the pattern's leading literal text can't
+                # match, and most titles in a feed are for other shows
+                match = prefix in title and search(title)
                 if match:
                     number = EpisodeNumber.from_regex_match(match)
-                    if number > original_numbers[sub]:
+                    if number > original_number:
                         await logging.info(
-                            f'MATCH: entry {index} {entry["title"]!r} has '
+                            f'MATCH: entry {index} {title!r} has '
                             + f'greater number than sub {sub.name!r}: '
-                            + f'{number} > {original_numbers[sub]}'
+                            + f'{number} > {original_number}'
                         )
                         sub.number = number
                         yield sub, entry
-                    else:
+                    elif debug:
                         await logging.debug(
-                            f'NO MATCH: entry {index} {entry["title"]!r} '
+                            f'NO MATCH: entry {index} {title!r} '
                             + 'matches but number less than or equal to sub '
                             + f'{sub.name!r}: {number} <= '
-                            + f'{original_numbers[sub]}'
+                            + f'{original_number}'
                         )
-                else:
+                elif debug:
                     await logging.debug(
-                        f'NO MATCH: entry {index} {entry["title"]!r} against '
+                        f'NO MATCH: entry {index} {title!r} against '
                         + f'sub {sub.name!r}'
                     )
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import sys
 from typing import Literal, Union
-from logging import Logger, StreamHandler, Formatter
+from logging import Logger, StreamHandler, Formatter, getLevelName
 
 from .utils import wrap_for_asyncio
 from .constants import NAME, LOG_MESSAGE_FORMAT
@@ -29,6 +29,15 @@ def configure(level: Level) -> None:
     _logger.addHandler(handler)
 
 
+# every message is handed off to the executor, so callers logging in a loop
+# should check this first rather than pay for that on discarded messages
+def is_enabled_for(level: Level) -> bool:
+    number = getLevelName(level)
+    # getLevelName gives back a string for names it doesn't know, such as
+    # DISABLE, which nothing is ever logged at
+    return isinstance(number, int) and _logger.isEnabledFor(number)
+
+
 debug = wrap_for_asyncio(_logger.debug)
 info = wrap_for_asyncio(_logger.info)
 warning = wrap_for_asyncio(_logger.warning)
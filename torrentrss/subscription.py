@@ -10,10 +10,35 @@ if TYPE_CHECKING:
     from .feed import Feed
 
 
+_REGEX_SPECIAL_CHARACTERS = frozenset('\\.^$*+?{}[]()|')
+_REGEX_QUANTIFIERS = frozenset('*+?{')
+
+
+def literal_prefix(regex: Pattern) -> str:
+    # the run of plain characters at the start of a pattern has to appear in
+    # any title it matches, which makes a cheap substring test a safe filter
+    # to run before the regex engine. anything that could make those
+    # characters optional or change how they match gives up on it instead.
+    if regex.flags & (re.IGNORECASE | re.VERBOSE) or '|' in regex.pattern:
+        return ''
+    prefix: List[str] = []
+    for character in regex.pattern:
+        if character in _REGEX_SPECIAL_CHARACTERS:
+            if character in _REGEX_QUANTIFIERS and prefix:
+                # the quantifier applies to the last character
+                prefix.pop()
+            break
+        prefix.append(character)
+    return ''.join(prefix)
+
+
 class Subscription:
+    __slots__ = ('feed', 'name', 'regex', 'prefix', 'number', 'command')
+
     feed: Feed
     name: str
     regex: Pattern
+    prefix: str
     number: EpisodeNumber
     command: Optional[Command]
 
@@ -42,6 +67,7 @@ class Subscription:
                 f'Feed {feed.name!r} sub {name!r} pattern '
                 f'{pattern!r} has no group for the episode number'
             )
+        self.prefix = literal_prefix(self.regex)
 
         self.number = EpisodeNumber(
             series=series_number,
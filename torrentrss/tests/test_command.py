@@ -9,7 +9,7 @@ from ..command import Command
 async def test_arguments() -> None:
     command = Command(['command', '$URL', '--option'])
 
-    with patch('torrentrss.command.run_subprocess') as mock:
+    with patch('torrentrss.command.start_subprocess') as mock:
         await command('http://test.com/test.torrent')
         mock.assert_called_once_with(
             args=['command', 'http://test.com/test.torrent', '--option'],
@@ -24,3 +24,19 @@ async def test_no_arguments() -> None:
     with patch('torrentrss.command.open_with_default_application') as mock:
         await command('http://test.com/test.torrent')
         mock.assert_called_once_with('http://test.com/test.torrent')
+
+
+def test_subbed_arguments_keeps_backslashes() -> None:
+    command = Command(['command', '--file=$URL'])
+
+    arguments = command.subbed_arguments(r'C:\new\test.torrent')
+    assert arguments == ['command', r'--file=C:\new\test.torrent']
+
+
+def test_url_indices() -> None:
+    command = Command(['command', '$URL', '--seed', '--file=$URL'])
+
+    assert command.url_indices == [1, 3]
+    assert command.subbed_arguments('a.torrent') == \
+        ['command', 'a.torrent', '--seed', '--file=a.torrent']
+    assert command.arguments == ['command', '$URL', '--seed', '--file=$URL']
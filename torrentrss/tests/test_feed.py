@@ -1,11 +1,15 @@
-from unittest.mock import patch
+from typing import List
+from unittest.mock import patch, MagicMock
 
 import pytest
-from feedparser import FeedParserDict
+from aiohttp import web, ClientSession
+from aiohttp.test_utils import TestServer
+from feedparser import FeedParserDict, parse as parse_feed
 
+from .utils import local_path
 from ..feed import Feed
+from ..errors import FeedError
 from ..episode_number import EpisodeNumber
-from .utils import task_mock
 
 
 @pytest.mark.asyncio
@@ -13,15 +17,18 @@ async def test_properties(feed: Feed) -> None:
     assert feed.name == 'Test feed 1'
     assert feed.url == 'https://test.com/rss'
     assert feed.user_agent is None
+    assert feed.headers == {}
+    assert feed.etag is None
+    assert feed.last_modified is None
     assert 'Test sub 1' in feed.subscriptions
     assert 'Test sub 2' in feed.subscriptions
 
 
 @pytest.mark.asyncio
 async def test_matching_subs(feed: Feed, rss: FeedParserDict) -> None:
-    with patch.object(feed, 'fetch', return_value=task_mock(rss)):
+    with patch.object(feed, 'fetch', return_value=rss):
         matches = []
-        async for match in feed.matching_subs():
+        async for match in feed.matching_subs(MagicMock()):
             matches.append(match)
 
     sub1 = feed.subscriptions['Test sub 1']
@@ -41,6 +48,96 @@ async def test_matching_subs(feed: Feed, rss: FeedParserDict) -> None:
     assert sub1.number == sub2.number == EpisodeNumber(3, 5)
 
 
+@pytest.mark.asyncio
+async def test_matching_subs_debug_disabled(feed: Feed, rss: FeedParserDict) -> None:
+    with patch.object(feed, 'fetch', return_value=rss), \
+            patch('torrentrss.feed.logging.is_enabled_for', return_value=False), \
+            patch('torrentrss.feed.logging.debug') as debug:
+        async for _ in feed.matching_subs(MagicMock()):
+            pass
+
+    debug.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_matching_subs_not_modified(feed: Feed) -> None:
+    with patch.object(feed, 'fetch', return_value=None):
+        matches = [match async for match in feed.matching_subs(MagicMock())]
+
+    assert matches == []
+    assert feed.subscriptions['Test sub 1'].number == EpisodeNumber(3, 1)
+
+
+@pytest.mark.asyncio
+async def test_fetch_conditional() -> None:
+    body = local_path('./testfeed.xml').read_bytes()
+    etag = '"abc123"'
+    last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    requests: List[web.Request] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request)
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304)
+        # served as HTML, like plenty of real sites do
+        return web.Response(
+            body=body,
+            content_type='text/html',
+            charset='utf-8',
+            headers={'ETag': etag, 'Last-Modified': last_modified}
+        )
+
+    async def broken_handler(request: web.Request) -> web.Response:
+        return web.Response(
+            body=b'<rss><channel><item>',
+            headers={'ETag': '"broken"'}
+        )
+
+    app = web.Application()
+    app.router.add_get('/rss', handler)
+    app.router.add_get('/broken', broken_handler)
+    async with TestServer(app) as server, ClientSession() as session:
+        feed = Feed(
+            name='Test feed',
+            url=str(server.make_url('/rss')),
+            user_agent='test agent',
+            subscriptions={}
+        )
+
+        rss = await feed.fetch(session)
+        assert rss is not None
+        assert not rss['bozo']
+        assert len(rss['entries']) == 20
+        assert feed.etag == etag
+        assert feed.last_modified == last_modified
+        assert requests[0].headers['User-Agent'] == 'test agent'
+        assert 'If-None-Match' not in requests[0].headers
+        assert 'If-Modified-Since' not in requests[0].headers
+
+        assert await feed.fetch(session) is None
+        assert requests[1].headers['User-Agent'] == 'test agent'
+        assert requests[1].headers['If-None-Match'] == etag
+        assert requests[1].headers['If-Modified-Since'] == last_modified
+        # the conditional headers are only added to a copy
+        assert feed.headers == {'User-Agent': 'test agent'}
+
+        feed.url = str(server.make_url('/broken'))
+        with pytest.raises(FeedError):
+            await feed.fetch(session)
+        assert feed.etag == etag
+        assert feed.last_modified == last_modified
+
+
+def test_html_title_sanitised() -> None:
+    rss = parse_feed(
+        '<feed xmlns="http://www.w3.org/2005/Atom"><entry>'
+        '<title type="html">Show &lt;b&gt;Name&lt;/b&gt; S01E02 '
+        '&lt;script&gt;x&lt;/script&gt;</title>'
+        '</entry></feed>'
+    )
+    assert rss['entries'][0]['title'] == 'Show <b>Name</b> S01E02'
+
+
 @pytest.mark.asyncio
 async def test_get_entry_url(rss: FeedParserDict) -> None:
     result = await Feed.get_entry_url(rss.entries[0])
@@ -0,0 +1,11 @@
+from unittest.mock import patch
+
+from .. import logging
+
+
+def test_is_enabled_for() -> None:
+    with patch.object(logging._logger, 'level', 20), \
+            patch.object(logging._logger, '_cache', {}):
+        assert logging.is_enabled_for('INFO')
+        assert not logging.is_enabled_for('DEBUG')
+        assert not logging.is_enabled_for('DISABLE')
@@ -1,8 +1,9 @@
+import re
 from unittest.mock import MagicMock
 
 import pytest
 
-from ..subscription import Subscription
+from ..subscription import Subscription, literal_prefix
 from ..episode_number import EpisodeNumber
 from ..errors import ConfigError
 
@@ -30,3 +31,18 @@ def test_invalid_regex(pattern) -> None:
             name='test subscription',
             pattern=pattern
         )
+
+
+@pytest.mark.parametrize('pattern, prefix', (
+    (r'Test Show 1 S(?P<series>[0-9]{2})E(?P<episode>[0-9]{2})', 'Test Show 1 S'),
+    (r'Show (?P<episode>\d+)', 'Show '),
+    (r'Shows? (?P<episode>\d+)', 'Show'),
+    (r'Show{2} (?P<episode>\d+)', 'Sho'),
+    (r'Show\.Name (?P<episode>\d+)', 'Show'),
+    (r'^Show (?P<episode>\d+)', ''),
+    (r'(?i)Show (?P<episode>\d+)', ''),
+    (r'Show A|Show B (?P<episode>\d+)', ''),
+))
+def test_literal_prefix(pattern, prefix) -> None:
+    assert literal_prefix(re.compile(pattern)) == prefix
+    assert literal_prefix(re.compile(pattern, re.IGNORECASE)) == ''
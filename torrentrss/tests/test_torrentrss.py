@@ -1,14 +1,18 @@
 import json
+import asyncio
+from pathlib import Path
 from io import StringIO, SEEK_SET
 from unittest.mock import patch, call
 
 import pytest
+from aiohttp import ClientSession
 from feedparser import FeedParserDict
 
 from ..torrentrss import TorrentRSS
 from ..episode_number import EpisodeNumber
 from ..feed import Feed
 from ..command import Command
+from ..errors import FeedError
 from .utils import task_mock
 
 
@@ -18,9 +22,32 @@ def test_properties(config: TorrentRSS) -> None:
     assert 'Test feed 2' in config.feeds
 
 
+def test_user_agent_kept_in_config() -> None:
+    config = TorrentRSS(Path('config.json'), {
+        'default_user_agent': 'default agent',
+        'feeds': {
+            'Feed with agent': {
+                'url': 'https://test.com/rss',
+                'user_agent': 'feed agent',
+                'subscriptions': {}
+            },
+            'Feed without agent': {
+                'url': 'https://test.com/rss2',
+                'subscriptions': {}
+            }
+        }
+    })
+
+    assert config.feeds['Feed with agent'].user_agent == 'feed agent'
+    assert config.feeds['Feed without agent'].user_agent == 'default agent'
+    feeds = json.loads(config.saved_text)['feeds']
+    assert feeds['Feed with agent']['user_agent'] == 'feed agent'
+    assert 'user_agent' not in feeds['Feed without agent']
+
+
 @pytest.mark.asyncio
 async def test_check_feeds(config: TorrentRSS, rss: FeedParserDict) -> None:
-    with patch.object(Feed, 'fetch', return_value=task_mock(rss)),  \
+    with patch.object(Feed, 'fetch', return_value=rss),  \
             patch.object(Command, '__call__', return_value=task_mock()) as command:
         await config.check_feeds()
 
@@ -41,9 +68,63 @@ async def test_check_feeds(config: TorrentRSS, rss: FeedParserDict) -> None:
     assert command.call_args_list == expected
 
 
+@pytest.mark.asyncio
+async def test_check_feeds_concurrently(config: TorrentRSS, rss: FeedParserDict) -> None:
+    in_progress = 0
+    most_in_progress = 0
+
+    async def fetch(session: ClientSession) -> FeedParserDict:
+        nonlocal in_progress, most_in_progress
+        in_progress += 1
+        most_in_progress = max(most_in_progress, in_progress)
+        await asyncio.sleep(0)
+        in_progress -= 1
+        return rss
+
+    with patch.object(Feed, 'fetch', side_effect=fetch),  \
+            patch.object(Command, '__call__', return_value=task_mock()):
+        await config.check_feeds()
+
+    # 'Feed without subs' returns before fetching
+    assert most_in_progress == 2
+
+
+@pytest.mark.asyncio
+async def test_check_feeds_error_cancels_other_feeds(config: TorrentRSS) -> None:
+    session_closed = False
+    used_after_close = False
+
+    async def fetch(self: Feed, session: ClientSession) -> FeedParserDict:
+        nonlocal used_after_close
+        if self.name == 'Test feed 1':
+            raise FeedError('test error')
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        used_after_close = session_closed
+        return FeedParserDict(entries=[])
+
+    real_close = ClientSession.close
+
+    async def close(session: ClientSession) -> None:
+        nonlocal session_closed
+        session_closed = True
+        await real_close(session)
+
+    with patch.object(Feed, 'fetch', autospec=True, side_effect=fetch),  \
+            patch.object(ClientSession, 'close', autospec=True, side_effect=close):
+        with pytest.raises(FeedError):
+            await config.check_feeds()
+        # give any feed left running the chance to carry on
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    assert session_closed
+    assert not used_after_close
+
+
 @pytest.mark.asyncio
 async def test_save_episode_numbers(config: TorrentRSS, rss: FeedParserDict):
-    with patch.object(Feed, 'fetch', return_value=task_mock(rss)),  \
+    with patch.object(Feed, 'fetch', return_value=rss),  \
             patch.object(Command, '__call__', return_value=task_mock()):
         await config.check_feeds()
 
@@ -75,3 +156,96 @@ async def test_save_episode_numbers(config: TorrentRSS, rss: FeedParserDict):
     assert feed2['Test sub 3']['episode_number'] == 5
     assert 'series_number' not in feed2['Sub matching nothing']
     assert 'episode_number' not in feed2['Sub matching nothing']
+
+
+@pytest.mark.asyncio
+async def test_save_feed_validators(config: TorrentRSS) -> None:
+    feed = config.feeds['Test feed 1']
+    feed.etag = '"abc123"'
+    feed.last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+    with StringIO() as file:
+        await config.save_episode_numbers(file)
+        file.seek(SEEK_SET)
+        json_dict = json.load(file)
+
+    feed_dict = json_dict['feeds']['Test feed 1']
+    assert feed_dict['etag'] == '"abc123"'
+    assert feed_dict['last_modified'] == 'Wed, 21 Oct 2015 07:28:00 GMT'
+    assert 'etag' not in json_dict['feeds']['Test feed 2']
+
+    reloaded = TorrentRSS(config.path, json_dict)
+    assert reloaded.feeds['Test feed 1'].etag == '"abc123"'
+    assert reloaded.feeds['Test feed 1'].last_modified == \
+        'Wed, 21 Oct 2015 07:28:00 GMT'
+
+
+@pytest.mark.asyncio
+async def test_save_removes_stale_validators(config: TorrentRSS) -> None:
+    feed = config.feeds['Test feed 1']
+    feed.etag = '"abc123"'
+    feed.last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    await config.save_episode_numbers(StringIO())
+
+    # a later response without an ETag
+    feed.etag = None
+    with StringIO() as file:
+        await config.save_episode_numbers(file)
+        file.seek(SEEK_SET)
+        feed_dict = json.load(file)['feeds']['Test feed 1']
+    assert 'etag' not in feed_dict
+    assert feed_dict['last_modified'] == 'Wed, 21 Oct 2015 07:28:00 GMT'
+    assert 'fingerprint' in feed_dict
+
+    feed.last_modified = None
+    with StringIO() as file:
+        await config.save_episode_numbers(file)
+        file.seek(SEEK_SET)
+        feed_dict = json.load(file)['feeds']['Test feed 1']
+    assert 'last_modified' not in feed_dict
+    assert 'fingerprint' not in feed_dict
+
+
+@pytest.mark.asyncio
+async def test_feed_validators_dropped_when_subs_edited(config: TorrentRSS) -> None:
+    config.feeds['Test feed 1'].etag = '"abc123"'
+    with StringIO() as file:
+        await config.save_episode_numbers(file)
+        file.seek(SEEK_SET)
+        json_dict = json.load(file)
+
+    # lowering an episode number to download it again
+    subs = json_dict['feeds']['Test feed 1']['subscriptions']
+    subs['Test sub 1']['episode_number'] = 0
+
+    reloaded = TorrentRSS(config.path, json_dict)
+    assert reloaded.feeds['Test feed 1'].etag is None
+    assert reloaded.feeds['Test feed 1'].last_modified is None
+
+
+@pytest.mark.asyncio
+async def test_feed_validators_dropped_when_url_edited(config: TorrentRSS) -> None:
+    config.feeds['Test feed 1'].last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    with StringIO() as file:
+        await config.save_episode_numbers(file)
+        file.seek(SEEK_SET)
+        json_dict = json.load(file)
+
+    json_dict['feeds']['Test feed 1']['url'] = 'https://other.com/rss'
+
+    reloaded = TorrentRSS(config.path, json_dict)
+    assert reloaded.feeds['Test feed 1'].etag is None
+    assert reloaded.feeds['Test feed 1'].last_modified is None
+
+
+@pytest.mark.asyncio
+async def test_save_only_when_changed(config: TorrentRSS) -> None:
+    with patch('torrentrss.torrentrss.write_text') as write_text:
+        await config.save_episode_numbers()
+        write_text.assert_not_called()
+
+        sub = config.feeds['Test feed 1'].subscriptions['Test sub 1']
+        sub.number = EpisodeNumber(3, 2)
+        await config.save_episode_numbers()
+        await config.save_episode_numbers()
+        write_text.assert_called_once()
@@ -0,0 +1,78 @@
+import os
+import sys
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from .. import utils
+from ..utils import (
+    read_text,
+    write_text,
+    start_subprocess,
+    open_with_default_application
+)
+
+
+@pytest.mark.asyncio
+async def test_write_text_replaces_file(tmp_path: Path) -> None:
+    path = tmp_path / 'config.json'
+    path.write_text('old contents')
+
+    await write_text(path, 'new contents')
+
+    assert await read_text(path) == 'new contents'
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.platform == 'win32', reason='uses symlinks and modes')
+async def test_write_text_follows_symlink(tmp_path: Path) -> None:
+    target = tmp_path / 'real.json'
+    target.write_text('old contents')
+    target.chmod(0o600)
+    link = tmp_path / 'config.json'
+    link.symlink_to(target)
+
+    await write_text(link, 'new contents')
+
+    assert link.is_symlink()
+    assert target.read_text() == 'new contents'
+    assert os.stat(target).st_mode & 0o777 == 0o600
+    assert sorted(tmp_path.iterdir()) == [link, target]
+
+
+@pytest.mark.asyncio
+async def test_write_text_failure_removes_temp_file(tmp_path: Path) -> None:
+    path = tmp_path / 'config.json'
+    path.write_text('old contents')
+
+    with patch('aiofile.AIOFile.fsync', side_effect=OSError):
+        with pytest.raises(OSError):
+            await write_text(path, 'new contents')
+
+    assert path.read_text() == 'old contents'
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.asyncio
+async def test_start_subprocess_keeps_and_reaps_children() -> None:
+    child = await start_subprocess(args=[sys.executable, '-c', ''])
+    assert child in utils._children
+
+    child.wait()
+    utils._reap_children()
+    assert child not in utils._children
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.platform != 'linux', reason='uses xdg-open')
+async def test_open_with_default_application() -> None:
+    with patch('torrentrss.utils.start_subprocess') as mock:
+        await open_with_default_application('http://test.com/test.torrent')
+        mock.assert_called_once_with(
+            args=['xdg-open', 'http://test.com/test.torrent'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 import json
+import asyncio
 from io import StringIO
 from os import PathLike
-from typing import Dict, Optional
+from typing import Dict, Optional, List, Tuple
 
 import jsonschema
+from aiohttp import ClientSession
 
 from . import logging
-from .feed import Feed
+from .feed import Feed, fingerprint_feed
 from .command import Command
-from .utils import Json, read_text, write_text
-from .constants import CONFIG_PATH, CONFIG_SCHEMA
+from .utils import Json, json_loads, read_text, write_text
+from .constants import CONFIG_SCHEMA, config_path
+
+
+# jsonschema.validate checks the schema itself and builds a new validator on
+# every call, so build one up front and reuse it
+_validator = jsonschema.Draft4Validator(CONFIG_SCHEMA)
 
 
 class TorrentRSS:
@@ -19,6 +26,7 @@ class TorrentRSS:
     config: Json
     feeds: Dict[str, Feed]
     default_command: Command
+    saved_text: str
 
     def __init__(self, path: PathLike, config: Json) -> None:
         self.path = path
@@ -26,42 +34,84 @@ class TorrentRSS:
         self.default_command = Command(config.get('default_command'))
 
         default_user_agent = config.get('default_user_agent')
+        # the feed dicts aren't modified here, as they're written back out as
+        # they are by save_episode_numbers
         self.feeds = {
             name: Feed(
                 name=name,
-                user_agent=feed_dict.pop('user_agent', default_user_agent),
-                **feed_dict
+                **{'user_agent': default_user_agent, **feed_dict}
             )
             for name, feed_dict in config['feeds'].items()
         }
+        # what save_episode_numbers would write if nothing changed, so that
+        # runs which find nothing new don't rewrite the file
+        self.saved_text = json.dumps(config, indent=4)
 
     @classmethod
-    async def from_path(cls, path: PathLike = CONFIG_PATH) -> TorrentRSS:
+    async def from_path(cls, path: Optional[PathLike] = None) -> TorrentRSS:
+        if path is None:
+            path = config_path()
         config_text = await read_text(path)
-        config = json.loads(config_text)
-        jsonschema.validate(config, CONFIG_SCHEMA)
+        config = json_loads(config_text)
+        _validator.validate(config)
 
         return cls(path, config)
 
-    async def check_feeds(self) -> None:
-        urls = [
+    async def feed_urls(
+        self,
+        feed: Feed,
+        session: ClientSession
+    ) -> List[Tuple[str, Command]]:
+        return [
             (
                 await Feed.get_entry_url(entry),
                 sub.command or self.default_command
             )
-            for feed in self.feeds.values()
-            async for sub, entry in feed.matching_subs()
+            async for sub, entry in feed.matching_subs(session)
         ]
-        for url, command in urls:
-            await command(url)
+
+    async def check_feeds(self) -> None:
+        # feeds are downloaded concurrently so that checking them takes as
+        # long as the slowest one rather than all of them added together.
+        # gather keeps the results in feed order, so commands are still run
+        # in the same order as before. the one session lets feeds hosted on
+        # the same site share its pooled connections.
+        async with ClientSession() as session:
+            tasks = [
+                asyncio.ensure_future(self.feed_urls(feed, session))
+                for feed in self.feeds.values()
+            ]
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                # gather doesn't stop the other feeds when one fails, so they
+                # are cancelled and waited on here before the session they
+                # use is closed
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        for urls in results:
+            for url, command in urls:
+                await command(url)
 
     # Optional parameter for writing to a StringIO during testing
     async def save_episode_numbers(self, file: Optional[StringIO] = None) -> None:
-        await logging.info('Writing episode numbers')
-
         json_feeds = self.config['feeds']
         for feed_name, feed in self.feeds.items():
-            json_subs = json_feeds[feed_name]['subscriptions']
+            feed_dict = json_feeds[feed_name]
+            # a validator the feed no longer sends is removed, rather than
+            # being sent back forever alongside a refreshed fingerprint
+            if feed.etag is None:
+                feed_dict.pop('etag', None)
+            else:
+                feed_dict['etag'] = feed.etag
+            if feed.last_modified is None:
+                feed_dict.pop('last_modified', None)
+            else:
+                feed_dict['last_modified'] = feed.last_modified
+
+            json_subs = feed_dict['subscriptions']
             for sub_name, sub in feed.subscriptions.items():
                 sub_dict = json_subs[sub_name]
                 if sub.number.series is not None:
@@ -69,11 +119,20 @@ class TorrentRSS:
                 if sub.number.episode is not None:
                     sub_dict['episode_number'] = sub.number.episode
 
+            if feed.etag is None and feed.last_modified is None:
+                feed_dict.pop('fingerprint', None)
+            else:
+                feed_dict['fingerprint'] = fingerprint_feed(feed.url, json_subs)
+
         text = json.dumps(self.config, indent=4)
-        if file is None:
-            await write_text(self.path, text)
-        else:
+        if file is not None:
             file.write(text)
+        elif text == self.saved_text:
+            await logging.info('Episode numbers unchanged, not writing')
+        else:
+            await logging.info('Writing episode numbers')
+            await write_text(self.path, text)
+            self.saved_text = text
 
     async def run(self) -> None:
         await self.check_feeds()
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import os
 import sys
+import json
+import atexit
+import shutil
 import asyncio
 import subprocess
 from os import PathLike
@@ -12,16 +15,23 @@ from typing import (
     overload,
     Optional,
     Dict,
+    Set,
     Any,
     TypeVar,
     Callable,
     Coroutine
 )
 
-from aiofile import AIOFile
-
 from .constants import NAME, WINDOWS
 
+# orjson parses several times faster than the standard library, but isn't a
+# dependency, so fall back when it isn't installed
+json_loads: Callable[[str], Any]
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 
 Json = Dict[str, Any]
 
@@ -57,6 +67,34 @@ def wrap_for_asyncio(func):
 
 
 run_subprocess = wrap_for_asyncio(subprocess.run)
+# launched programs' handles are kept rather than dropped while they may still
+# be running, and are reaped with poll once they've exited. anything still
+# running when the program exits, like a torrent client it started, is left to
+# carry on.
+_children: Set[subprocess.Popen] = set()
+
+
+def _reap_children() -> None:
+    for child in tuple(_children):
+        if child.poll() is not None:
+            _children.discard(child)
+
+
+atexit.register(_reap_children)
+
+
+async def start_subprocess(*args, **kwargs) -> subprocess.Popen:
+    _reap_children()
+    # Popen returns as soon as the child has been spawned rather than waiting
+    # for it to exit, so launching many torrents doesn't tie up an executor
+    # thread per still-running program
+    loop = asyncio.get_event_loop()
+    child = await loop.run_in_executor(
+        None,
+        partial(subprocess.Popen, *args, **kwargs)
+    )
+    _children.add(child)
+    return child
 
 
 async def show_exception_notification(exception: Exception) -> None:
@@ -76,24 +114,50 @@ async def show_exception_notification(exception: Exception) -> None:
         pass
 
 
+# aiofile is imported on first use, as loading its native AIO backend is a
+# noticeable part of startup for --version and --schema, which never touch a
+# file
 async def read_text(path: PathLike) -> str:
+    from aiofile import AIOFile
     async with AIOFile(path) as file:
         return await file.read()
 
 
 async def write_text(path: PathLike, text: str) -> None:
-    async with AIOFile(path, mode='w') as file:
-        await file.write(text)
-        await file.fsync()
-
-
-async def open_with_default_application(url: str) -> None:
-    if WINDOWS:
+    from aiofile import AIOFile
+    # written to a temporary file which then replaces the original, so that
+    # being interrupted part way through can't leave the file truncated. the
+    # path is resolved first so that a symlinked file is updated rather than
+    # the link being replaced, and the original's permissions are kept.
+    real_path = os.path.realpath(path)
+    temp_path = f'{real_path}.tmp'
+    try:
+        async with AIOFile(temp_path, mode='w') as file:
+            await file.write(text)
+            await file.fsync()
+        if os.path.exists(real_path):
+            shutil.copymode(real_path, temp_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    os.replace(temp_path, real_path)
+
+
+# the platform can't change while running, so the right version is picked
+# once here rather than checking on every launch
+if WINDOWS:
+    async def open_with_default_application(url: str) -> None:
         # startfile cannot be waited upon at all, so just complete immediately
         os.startfile(url)
-        return
-    await run_subprocess(
-        args=['open' if sys.platform == 'darwin' else 'xdg-open', url],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
+else:
+    _open_program = 'open' if sys.platform == 'darwin' else 'xdg-open'
+
+    async def open_with_default_application(url: str) -> None:
+        await start_subprocess(
+            args=[_open_program, url],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )